@@ -1,13 +1,16 @@
 # Thunder/bot/plugins/stream.py
 
 import asyncio
-import secrets
-from typing import Any, Dict, Optional
-from urllib.parse import urlsplit, urlunsplit, quote, urlencode, parse_qsl
+import functools
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit, quote
 
 from pyrogram import Client, enums, filters
 from pyrogram.errors import MessageNotModified, MessageDeleteForbidden
-from pyrogram.errors import ButtonUrlInvalid  # specific exception
+from pyrogram.errors import ButtonUrlInvalid, MediaCaptionTooLong  # specific exceptions
 from pyrogram.types import (InlineKeyboardButton, InlineKeyboardMarkup,
                             LinkPreviewOptions, Message)
 
@@ -17,30 +20,84 @@ from Thunder.utils.bot_utils import (gen_links, is_admin, log_newusr, notify_own
 from Thunder.utils.database import db
 from Thunder.utils.decorators import (check_banned, get_shortener_status,
                                       require_token)
+from Thunder.utils.file_properties import get_uniqid
 from Thunder.utils.force_channel import force_channel_check
 from Thunder.utils.handler import handle_flood_wait
 from Thunder.utils.logger import logger
 from Thunder.utils.messages import *
 from Thunder.vars import Var
 
+_NO_PREVIEW = LinkPreviewOptions(is_disabled=True)
+
 
 async def fwd_media(m_msg: Message) -> Optional[Message]:
     try:
         return await handle_flood_wait(m_msg.copy, chat_id=Var.BIN_CHANNEL)
+    except MediaCaptionTooLong as e:
+        logger.debug(f"MEDIA_CAPTION_TOO_LONG error, retrying without caption: {e}")
+        return await handle_flood_wait(m_msg.copy, chat_id=Var.BIN_CHANNEL, caption=None)
     except Exception as e:
-        if "MEDIA_CAPTION_TOO_LONG" in str(e):
-            logger.debug(f"MEDIA_CAPTION_TOO_LONG error, retrying without caption: {e}")
-            return await handle_flood_wait(m_msg.copy, chat_id=Var.BIN_CHANNEL, caption=None)
         logger.error(f"Error fwd_media copy: {e}", exc_info=True)
         return None
 
 
+async def fwd_media_batch(bot: Client, chat_id: int, msgs: List[Message]) -> List[Optional[Message]]:
+    """
+    Forward many messages to BIN_CHANNEL in one call, hiding the sender so the
+    result matches a copy(). Entries are None for files that did not land, so
+    callers can fall back to fwd_media for just those. Matching a partial
+    forward assumes msgs holds no duplicate file_unique_ids, which process_batch
+    guarantees by deduplicating first.
+    """
+    try:
+        stored = await handle_flood_wait(
+            bot.forward_messages,
+            Var.BIN_CHANNEL,
+            chat_id,
+            [m.id for m in msgs],
+            hide_sender_name=True
+        )
+    except Exception as e:
+        logger.error(f"Error fwd_media_batch forward: {e}", exc_info=True)
+        return [None] * len(msgs)
+    if isinstance(stored, Message):
+        stored = [stored]
+    stored = stored or []
+    if len(stored) == len(msgs):
+        return stored
+
+    # partial forward: match what landed by file_unique_id so only the
+    # missing files are copied again and BIN_CHANNEL gets no duplicates
+    landed = {}
+    for s_msg in stored:
+        uniq_id = get_uniqid(s_msg)
+        if uniq_id:
+            landed[uniq_id] = s_msg
+    matched = [landed.get(uid) if (uid := get_uniqid(m)) else None for m in msgs]
+    logger.warning(
+        f"fwd_media_batch forwarded {len(stored)}/{len(msgs)} messages; "
+        f"retrying {matched.count(None)} individually."
+    )
+    return matched
+
+
 # ------------------ URL SANITIZING & BUTTONS (robust) ------------------
 
+# whitespace, control and other characters Telegram rejects unescaped in button URLs
+_UNSAFE_RE = re.compile(r'[\s\x00-\x1f\x7f"<>\\^`{|}]')
+_TME_PREFIXES = ("t.me/", "telegram.me/", "telegram.dog/")
+_HTTP_PREFIXES = ("http://", "https://")
+_URL_SCHEMES = frozenset(("http", "https"))
+_QUOTE_SAFE = "/%._-~"
+_QUERY_SAFE = "=&%+/?:@._-~"
+
+
+@functools.lru_cache(maxsize=4096)
 def _sanitize_url(raw: Optional[str]) -> Optional[str]:
     """
     Make sure URL is http(s), has a host, is stripped, and percent-encodes spaces etc.
     Returns a safe, reconstructed URL or None.
+    Pure function, so results are memoized; links repeat across a session.
     """
     if not raw:
         return None
@@ -48,26 +105,33 @@ def _sanitize_url(raw: Optional[str]) -> Optional[str]:
     if not s:
         return None
 
+    # fast path: generated links are already canonical, skip the parse/rebuild;
+    # non-ASCII or unsafe characters still need percent-encoding so they take
+    # the slow path, and a missing host falls through to be rejected there.
+    if s.startswith(_HTTP_PREFIXES) and s.isascii() and _UNSAFE_RE.search(s) is None:
+        host_start = s.index("://") + 3
+        if host_start < len(s) and s[host_start] not in "/?#":
+            return s if len(s) <= 1024 else None
+
     # common cases returned by some shorteners without protocol
-    if s.startswith("t.me/") or s.startswith("telegram.me/") or s.startswith("telegram.dog/"):
+    if s.startswith(_TME_PREFIXES):
         s = "https://" + s
 
     # reject non-http(s)
     parts = urlsplit(s)
-    if parts.scheme not in ("http", "https"):
+    if parts.scheme not in _URL_SCHEMES:
         return None
     if not parts.netloc:
         return None
-    if any(c.isspace() for c in s):
-        # recompose with encoded path/query to remove spaces
-        path = quote(parts.path, safe="/%._-~")
-        query = urlencode(parse_qsl(parts.query, keep_blank_values=True), doseq=True)
-        s = urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
-        parts = urlsplit(s)
-
-    # Telegram can still complain on weird chars; re-encode path & query always.
-    path = quote(parts.path, safe="/%._-~")
-    query = urlencode(parse_qsl(parts.query, keep_blank_values=True), doseq=True)
+    # re-encoding only grows the URL, so reject oversized input up front
+    if len(s) > 1024:
+        return None
+
+    # encode path & query once; this also removes any spaces, and Telegram
+    # can still complain on weird chars otherwise. quote() is a cached per-byte
+    # table scan that returns early when nothing needs escaping.
+    path = quote(parts.path, safe=_QUOTE_SAFE)
+    query = quote(parts.query, safe=_QUERY_SAFE)
     safe = urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
 
     # conservative length guard (Telegram buttons are picky)
@@ -77,28 +141,36 @@ def _sanitize_url(raw: Optional[str]) -> Optional[str]:
     return safe
 
 
+@functools.lru_cache(maxsize=1024)
+def _build_markup(stream: Optional[str], download: Optional[str]) -> Optional[InlineKeyboardMarkup]:
+    """
+    Markup is only serialized when sent, so one instance can be shared across messages.
+    """
+    row = []
+    if stream:
+        row.append(InlineKeyboardButton(MSG_BUTTON_STREAM_NOW, url=stream))
+    if download:
+        row.append(InlineKeyboardButton(MSG_BUTTON_DOWNLOAD, url=download))
+    if row:
+        return InlineKeyboardMarkup([row])
+    return None
+
+
 def get_link_buttons(links: Dict[str, Any]) -> Optional[InlineKeyboardMarkup]:
     stream = _sanitize_url(links.get("stream_link"))
     download = _sanitize_url(links.get("online_link"))
 
-    row = []
-    if stream:
-        row.append(InlineKeyboardButton(MSG_BUTTON_STREAM_NOW, url=stream))
-    else:
+    if not stream:
         bad = links.get("stream_link")
         if bad:
             logger.warning(f"Invalid stream_link for button: {bad}")
 
-    if download:
-        row.append(InlineKeyboardButton(MSG_BUTTON_DOWNLOAD, url=download))
-    else:
+    if not download:
         bad = links.get("online_link")
         if bad:
             logger.warning(f"Invalid online_link for button: {bad}")
 
-    if row:
-        return InlineKeyboardMarkup([row])
-    return None
+    return _build_markup(stream, download)
 
 
 async def _safe_send_with_buttons(func, *, text: str, reply_markup: Optional[InlineKeyboardMarkup], **kwargs):
@@ -110,61 +182,106 @@ async def _safe_send_with_buttons(func, *, text: str, reply_markup: Optional[Inl
     except ButtonUrlInvalid as e:
         logger.error(f"ButtonUrlInvalid: {e}. Retrying without buttons.")
         return await handle_flood_wait(func, text, reply_markup=None, **kwargs)
-    except Exception as e:
-        # Some other error with markup — fallback to no buttons
-        if "BUTTON_URL_INVALID" in str(e):
-            logger.error(f"Button error (generic): {e}. Retrying without buttons.")
-            return await handle_flood_wait(func, text, reply_markup=None, **kwargs)
-        raise
 
 
-async def send_link(msg: Message, links: Dict[str, Any]):
-    body = MSG_LINKS.format(
+def _format_links(links: Dict[str, Any]) -> str:
+    return MSG_LINKS.format(
         file_name=links.get('media_name', 'Unknown'),
         file_size=links.get('media_size', 'Unknown'),
         download_link=links.get('online_link', 'N/A'),
         stream_link=links.get('stream_link', 'N/A')
     )
+
+
+async def send_link(msg: Message, links: Dict[str, Any], body: Optional[str] = None):
+    if body is None:
+        body = _format_links(links)
     markup = get_link_buttons(links)
 
-    logger.info(f"Generated links: online={links.get('online_link')} | stream={links.get('stream_link')} | has_markup={bool(markup)}")
+    logger.debug("Generated links: online=%s | stream=%s | has_markup=%s",
+                 links.get('online_link'), links.get('stream_link'), markup is not None)
 
     await _safe_send_with_buttons(
         msg.reply_text,
         text=body,
         quote=True,
         parse_mode=enums.ParseMode.MARKDOWN,
-        link_preview_options=LinkPreviewOptions(is_disabled=True),
+        link_preview_options=_NO_PREVIEW,
         reply_markup=markup
     )
 
 
 # ------------------ COMMAND & HANDLERS ------------------
 
+_ALL_MEDIA = (filters.document | filters.video | filters.photo | filters.audio |
+              filters.voice | filters.animation | filters.video_note)
+_CHANNEL_MEDIA = filters.document | filters.video | filters.audio
+_BANNED_CHANNEL = filters.chat(list(Var.BANNED_CHANNELS))
+_INVITE_CACHE: Dict[str, Tuple[str, InlineKeyboardMarkup]] = {}
+
+
+def _get_invite(username: str) -> Tuple[str, InlineKeyboardMarkup]:
+    entry = _INVITE_CACHE.get(username)
+    if entry is None:
+        url = f"https://t.me/{username}?start=start"
+        entry = (url, InlineKeyboardMarkup([[InlineKeyboardButton(MSG_BUTTON_START_CHAT, url=url)]]))
+        _INVITE_CACHE[username] = entry
+    return entry
+
+
+async def _guard_all(bot: Client, msg: Message, lookups: asyncio.Future) -> Optional[list]:
+    """
+    Run the access guards while read-only `lookups` proceed concurrently.
+    Guards reply on denial, so they stay sequential to send at most one message.
+    Returns the lookup results, or None when a guard rejected the message.
+    """
+    if not (await check_banned(bot, msg) and
+            await require_token(bot, msg) and
+            await force_channel_check(bot, msg)):
+        lookups.cancel()
+        # retrieve the cancelled result so asyncio doesn't log it as unhandled
+        await asyncio.gather(lookups, return_exceptions=True)
+        return None
+    results = await lookups
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
+async def _user_known(user_id: int) -> bool:
+    # a lookup error just means log_newusr runs and handles it as before
+    try:
+        return await db.is_user_exist(user_id)
+    except Exception:
+        return False
+
+
 @StreamBot.on_message(filters.command("link") & ~filters.private)
 async def link_handler(bot: Client, msg: Message, **kwargs):
-    if not await check_banned(bot, msg):
-        return
-    if not await require_token(bot, msg):
+    in_group = msg.chat.type in [enums.ChatType.GROUP, enums.ChatType.SUPERGROUP]
+    checks = await _guard_all(bot, msg, asyncio.gather(
+        db.is_user_exist(msg.from_user.id) if msg.from_user else asyncio.sleep(0, result=True),
+        is_admin(bot, msg.chat.id) if in_group else asyncio.sleep(0, result=True),
+        return_exceptions=True
+    ))
+    if checks is None:
         return
-    if not await force_channel_check(bot, msg):
-        return
-    shortener_val = await get_shortener_status(bot, msg)
-    if msg.from_user and not await db.is_user_exist(msg.from_user.id):
-        invite_link = f"https://t.me/{bot.me.username}?start=start"
+    user_exists, bot_is_admin = checks
+    if not user_exists:
+        invite_link, invite_markup = _get_invite(bot.me.username)
         await handle_flood_wait(
             msg.reply_text,
             MSG_ERROR_START_BOT.format(invite_link=invite_link),
-            link_preview_options=LinkPreviewOptions(is_disabled=True),
+            link_preview_options=_NO_PREVIEW,
             parse_mode=enums.ParseMode.MARKDOWN,
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(MSG_BUTTON_START_CHAT, url=invite_link)]]),
+            reply_markup=invite_markup,
             quote=True
         )
         return
-    if msg.chat.type in [enums.ChatType.GROUP, enums.ChatType.SUPERGROUP]:
-        if not await is_admin(bot, msg.chat.id):
-            await reply_user_err(msg, MSG_ERROR_NOT_ADMIN)
-            return
+    if not bot_is_admin:
+        await reply_user_err(msg, MSG_ERROR_NOT_ADMIN)
+        return
     if not msg.reply_to_message:
         await reply_user_err(msg, MSG_ERROR_REPLY_FILE)
         return
@@ -172,17 +289,17 @@ async def link_handler(bot: Client, msg: Message, **kwargs):
         await reply_user_err(msg, MSG_ERROR_NO_FILE)
         return
 
-    parts = msg.text.split()
+    parts = msg.text.split(maxsplit=2)
     num_files = 1
     if len(parts) > 1:
-        try:
-            num_files = int(parts[1])
-            if not 1 <= num_files <= Var.MAX_BATCH_FILES:
-                await reply_user_err(msg, MSG_ERROR_NUMBER_RANGE.format(max_files=Var.MAX_BATCH_FILES))
-                return
-        except ValueError:
+        arg = parts[1]
+        if not (arg.isascii() and arg.isdigit()):
             await reply_user_err(msg, MSG_ERROR_INVALID_NUMBER)
             return
+        num_files = int(arg)
+        if not 1 <= num_files <= Var.MAX_BATCH_FILES:
+            await reply_user_err(msg, MSG_ERROR_NUMBER_RANGE.format(max_files=Var.MAX_BATCH_FILES))
+            return
 
     status_msg = await handle_flood_wait(msg.reply_text, MSG_PROCESSING_REQUEST, quote=True)
     shortener_val = kwargs.get('shortener', Var.SHORTEN_MEDIA_LINKS)
@@ -196,21 +313,22 @@ async def link_handler(bot: Client, msg: Message, **kwargs):
 @StreamBot.on_message(
     filters.private &
     filters.incoming &
-    (filters.document | filters.video | filters.photo | filters.audio |
-     filters.voice | filters.animation | filters.video_note),
+    _ALL_MEDIA,
     group=4
 )
 async def private_receive_handler(bot: Client, msg: Message, **kwargs):
-    if not await check_banned(bot, msg):
-        return
-    if not await require_token(bot, msg):
-        return
-    if not await force_channel_check(bot, msg):
+    checks = await _guard_all(bot, msg, asyncio.gather(
+        get_shortener_status(bot, msg),
+        _user_known(msg.from_user.id) if msg.from_user else asyncio.sleep(0, result=True),
+        return_exceptions=True
+    ))
+    if checks is None:
         return
-    shortener_val = await get_shortener_status(bot, msg)
+    shortener_val, user_exists = checks
     if not msg.from_user:
         return
-    await log_newusr(bot, msg.from_user.id, msg.from_user.first_name or "")
+    if not user_exists:
+        await log_newusr(bot, msg.from_user.id, msg.from_user.first_name or "")
     status_msg = await handle_flood_wait(msg.reply_text, MSG_PROCESSING_FILE, quote=True)
     await process_single(bot, msg, msg, status_msg, shortener_val)
 
@@ -218,17 +336,26 @@ async def private_receive_handler(bot: Client, msg: Message, **kwargs):
 @StreamBot.on_message(
     filters.channel &
     filters.incoming &
-    (filters.document | filters.video | filters.audio) &
-    ~filters.chat(Var.BIN_CHANNEL),
+    _CHANNEL_MEDIA &
+    _BANNED_CHANNEL,
+    group=-1
+)
+async def banned_channel_handler(bot: Client, msg: Message):
+    try:
+        await handle_flood_wait(bot.leave_chat, msg.chat.id)
+    except Exception as e:
+        logger.error(f"Error leaving banned channel {msg.chat.id}: {e}")
+
+
+@StreamBot.on_message(
+    filters.channel &
+    filters.incoming &
+    _CHANNEL_MEDIA &
+    ~filters.chat(Var.BIN_CHANNEL) &
+    ~_BANNED_CHANNEL,
     group=-1
 )
 async def channel_receive_handler(bot: Client, msg: Message):
-    if hasattr(Var, 'BANNED_CHANNELS') and msg.chat.id in Var.BANNED_CHANNELS:
-        try:
-            await handle_flood_wait(bot.leave_chat, msg.chat.id)
-        except Exception as e:
-            logger.error(f"Error leaving banned channel {msg.chat.id}: {e}")
-        return
     if not await is_admin(bot, msg.chat.id):
         logger.debug(f"Bot is not admin in channel {msg.chat.id} ({msg.chat.title or 'Unknown'}). Ignoring message.")
         return
@@ -248,7 +375,7 @@ async def channel_receive_handler(bot: Client, msg: Message):
                 online_link=links.get('online_link', 'N/A'),
                 stream_link=links.get('stream_link', 'N/A')
             ),
-            link_preview_options=LinkPreviewOptions(is_disabled=True),
+            link_preview_options=_NO_PREVIEW,
             quote=True
         )
 
@@ -276,72 +403,111 @@ async def channel_receive_handler(bot: Client, msg: Message):
         logger.error(f"Error in channel_receive_handler for message {msg.id}: {e}", exc_info=True)
 
 
-async def process_single(bot: Client, msg: Message, file_msg: Message, status_msg: Message, shortener_val: bool, original_request_msg: Optional[Message] = None):
+_background_tasks: Set[asyncio.Task] = set()
+# error IDs are display-only, so a userspace RNG is enough (no getrandom syscall)
+_error_rng = random.Random()
+
+
+async def _swallow(coro):
+    try:
+        await coro
+    except Exception as e:
+        logger.error(f"Error in background task: {e}", exc_info=True)
+
+
+def _spawn(coro):
+    """
+    Run a cosmetic follow-up off the critical path; errors are logged and dropped.
+    """
+    task = asyncio.create_task(_swallow(coro))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _delete_status(status_msg: Message):
+    try:
+        await handle_flood_wait(status_msg.delete)
+    except MessageDeleteForbidden:
+        logger.debug(f"Failed to delete status message {status_msg.id} due to permissions.")
+    except Exception as e:
+        logger.error(f"Error deleting status message {status_msg.id}: {e}", exc_info=True)
+
+
+async def _send_dm_single(bot: Client, msg: Message, links: Dict[str, Any], body: str):
+    try:
+        single_dm_text = MSG_DM_SINGLE_PREFIX.format(chat_title=msg.chat.title or "the chat") + "\n" + body
+        markup = get_link_buttons(links)
+        await _safe_send_with_buttons(
+            bot.send_message,
+            text=single_dm_text,
+            chat_id=msg.from_user.id,
+            link_preview_options=_NO_PREVIEW,
+            parse_mode=enums.ParseMode.MARKDOWN,
+            reply_markup=markup
+        )
+    except Exception as e:
+        logger.error(f"Error sending DM for single file: {e}", exc_info=True)
+        await reply_user_err(msg, MSG_ERROR_DM_FAILED)
+
+
+async def _send_bin_log(stored_msg: Message, source_msg: Message, links: Dict[str, Any]):
+    source_info = ""
+    source_id = 0
+    if source_msg.from_user:
+        source_info = source_msg.from_user.full_name or (f"@{source_msg.from_user.username}" if source_msg.from_user.username else "Unknown User")
+        source_id = source_msg.from_user.id
+    elif source_msg.chat.type == enums.ChatType.CHANNEL:
+        source_info = source_msg.chat.title or "Unknown Channel"
+        source_id = source_msg.chat.id
+
+    if source_info and source_id:
+        await handle_flood_wait(
+            stored_msg.reply_text,
+            MSG_NEW_FILE_REQUEST.format(
+                source_info=source_info,
+                id_=source_id,
+                online_link=links.get('online_link', 'N/A'),
+                stream_link=links.get('stream_link', 'N/A')
+            ),
+            link_preview_options=_NO_PREVIEW,
+            quote=True
+        )
+
+
+async def process_single(bot: Client, msg: Message, file_msg: Message, status_msg: Message, shortener_val: bool, original_request_msg: Optional[Message] = None, stored_msg: Optional[Message] = None):
     try:
-        stored_msg = await fwd_media(file_msg)
+        if not stored_msg:
+            stored_msg = await fwd_media(file_msg)
         if not stored_msg:
             logger.error(f"Failed to forward media for message {file_msg.id}. Skipping.")
             return None
 
         links = await gen_links(stored_msg, shortener=shortener_val)
-        logger.info(f"Generated links: {links}")
+        logger.debug("Generated links: %s", links)
 
+        body = _format_links(links)
+        # the reply, DM copy and BIN-log entry are independent once links exist
+        tasks = [_send_bin_log(stored_msg, original_request_msg or msg, links)]
         if not original_request_msg:
-            await send_link(msg, links)
+            tasks.append(send_link(msg, links, body=body))
 
-        if msg.chat.type != enums.ChatType.PRIVATE and msg.from_user:
-            try:
-                single_dm_text = MSG_DM_SINGLE_PREFIX.format(chat_title=msg.chat.title or "the chat") + "\n" + \
-                                 MSG_LINKS.format(
-                                     file_name=links.get('media_name', 'Unknown'),
-                                     file_size=links.get('media_size', 'Unknown'),
-                                     download_link=links.get('online_link', 'N/A'),
-                                     stream_link=links.get('stream_link', 'N/A')
-                                 )
-                markup = get_link_buttons(links)
-                await _safe_send_with_buttons(
-                    bot.send_message,
-                    text=single_dm_text,
-                    chat_id=msg.from_user.id,
-                    link_preview_options=LinkPreviewOptions(is_disabled=True),
-                    parse_mode=enums.ParseMode.MARKDOWN,
-                    reply_markup=markup
-                )
-            except Exception as e:
-                logger.error(f"Error sending DM for single file: {e}", exc_info=True)
-                await reply_user_err(msg, MSG_ERROR_DM_FAILED)
-
-        # log to BIN thread
-        source_msg = original_request_msg if original_request_msg else msg
-        source_info = ""
-        source_id = 0
-        if source_msg.from_user:
-            source_info = source_msg.from_user.full_name or (f"@{source_msg.from_user.username}" if source_msg.from_user.username else "Unknown User")
-            source_id = source_msg.from_user.id
-        elif source_msg.chat.type == enums.ChatType.CHANNEL:
-            source_info = source_msg.chat.title or "Unknown Channel"
-            source_id = source_msg.chat.id
-
-        if source_info and source_id:
-            await handle_flood_wait(
-                stored_msg.reply_text,
-                MSG_NEW_FILE_REQUEST.format(
-                    source_info=source_info,
-                    id_=source_id,
-                    online_link=links.get('online_link', 'N/A'),
-                    stream_link=links.get('stream_link', 'N/A')
-                ),
-                link_preview_options=LinkPreviewOptions(is_disabled=True),
-                quote=True
-            )
+        send_dm = msg.chat.type != enums.ChatType.PRIVATE and msg.from_user
+        if send_dm and original_request_msg:
+            tasks.append(_send_dm_single(bot, msg, links, body))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(results[0], Exception):
+            logger.error(f"Error logging file to BIN channel: {results[0]}", exc_info=results[0])
+        for result in results[1:]:
+            if isinstance(result, Exception):
+                raise result
+
+        if send_dm and not original_request_msg:
+            # the group reply now carries the links; the DM copy can trail
+            _spawn(_send_dm_single(bot, msg, links, body))
 
         if status_msg:
-            try:
-                await handle_flood_wait(status_msg.delete)
-            except MessageDeleteForbidden:
-                logger.debug(f"Failed to delete status message {status_msg.id} due to permissions.")
-            except Exception as e:
-                logger.error(f"Error deleting status message {status_msg.id}: {e}", exc_info=True)
+            _spawn(_delete_status(status_msg))
 
         return links
 
@@ -359,29 +525,65 @@ async def process_single(bot: Client, msg: Message, file_msg: Message, status_ms
 
         await notify_own(bot, MSG_CRITICAL_ERROR.format(
             error=str(e),
-            error_id=secrets.token_hex(6)
+            error_id=f"{_error_rng.getrandbits(48):012x}"
         ))
         return None
 
 
+async def _process_bounded(sem: asyncio.Semaphore, bot: Client, msg: Message, file_msg: Message, shortener_val: bool, stored_msg: Optional[Message]):
+    async with sem:
+        return await process_single(bot, msg, file_msg, None, shortener_val, original_request_msg=msg, stored_msg=stored_msg)
+
+
+_STATUS_EDIT_INTERVAL = 2.0
+
+
+async def _send_dm_batch(bot: Client, msg: Message, chunk_text: str):
+    try:
+        await handle_flood_wait(
+            bot.send_message,
+            chat_id=msg.from_user.id,
+            text=MSG_DM_BATCH_PREFIX.format(chat_title=msg.chat.title or "the chat") + "\n" + chunk_text,
+            link_preview_options=_NO_PREVIEW,
+            parse_mode=enums.ParseMode.MARKDOWN
+        )
+    except Exception as e:
+        logger.error(f"Error sending DM in batch: {e}", exc_info=True)
+        await reply_user_err(msg, MSG_ERROR_DM_FAILED)
+
+
 async def process_batch(bot: Client, msg: Message, start_id: int, count: int, status_msg: Message, shortener_val: bool):
+    sem = asyncio.Semaphore(Var.BATCH_CONCURRENCY)
     processed = 0
     failed = 0
     links_list = []
-    for batch_start in range(0, count, 10):
-        batch_size = min(10, count - batch_start)
-        batch_ids = list(range(start_id + batch_start, start_id + batch_start + batch_size))
+    seen = set()
+    duplicates = 0
+    last_edit = 0.0
+
+    async def edit_status(text: str):
+        # every edit is a flood-limited RPC; keep progress updates to one per interval
+        nonlocal last_edit
+        now = time.monotonic()
+        if now - last_edit < _STATUS_EDIT_INTERVAL:
+            return
+        last_edit = now
         try:
-            await handle_flood_wait(
-                status_msg.edit_text,
-                MSG_PROCESSING_BATCH.format(
-                    batch_number=(batch_start // 10) + 1,
-                    total_batches=(count + 9) // 10,
-                    file_count=batch_size
-                )
-            )
+            await handle_flood_wait(status_msg.edit_text, text)
         except MessageNotModified:
             pass
+
+    window = Var.BATCH_WINDOW
+    total_batches = (count + window - 1) // window
+    for batch_number, batch_start in enumerate(range(0, count, window), start=1):
+        batch_size = min(window, count - batch_start)
+        first_id = start_id + batch_start
+        batch_ids = list(range(first_id, first_id + batch_size))
+        await edit_status(MSG_PROCESSING_BATCH.format(
+            batch_number=batch_number,
+            total_batches=total_batches,
+            file_count=batch_size
+        ))
         try:
             messages = await handle_flood_wait(bot.get_messages, msg.chat.id, batch_ids)
             if messages is None:
@@ -389,57 +591,68 @@ async def process_batch(bot: Client, msg: Message, start_id: int, count: int, st
         except Exception as e:
             logger.error(f"Error getting messages in batch: {e}", exc_info=True)
             messages = []
+        media_msgs = []
         for m in messages:
-            if m and m.media:
-                links = await process_single(bot, msg, m, None, shortener_val, original_request_msg=msg)
-                if links:
-                    links_list.append(links.get('online_link', ''))
-                    processed += 1
-                else:
-                    failed += 1
+            if not (m and m.media):
+                failed += 1
+                continue
+            uniq_id = get_uniqid(m)
+            if uniq_id:
+                if uniq_id in seen:
+                    duplicates += 1
+                    continue
+                seen.add(uniq_id)
+            media_msgs.append(m)
+        stored_msgs = await fwd_media_batch(bot, msg.chat.id, media_msgs) if media_msgs else []
+        results = await asyncio.gather(
+            *(_process_bounded(sem, bot, msg, m, shortener_val, stored)
+              for m, stored in zip(media_msgs, stored_msgs)),
+            return_exceptions=True
+        )
+        for links in results:
+            if isinstance(links, Exception):
+                logger.error(f"Error processing file in batch: {links}", exc_info=links)
+                failed += 1
+            elif links:
+                links_list.append(links.get('online_link', ''))
+                processed += 1
             else:
                 failed += 1
-        if (processed + failed) % 5 == 0 or (processed + failed) == count:
-            try:
-                await handle_flood_wait(
-                    status_msg.edit_text,
-                    MSG_PROCESSING_STATUS.format(
-                        processed=processed,
-                        total=count,
-                        failed=failed
-                    )
-                )
-            except MessageNotModified:
-                pass
+        await edit_status(MSG_PROCESSING_STATUS.format(
+            processed=processed,
+            total=count,
+            failed=failed
+        ))
+    undelivered = 0
     for i in range(0, len(links_list), 20):
         chunk = links_list[i:i+20]
-        chunk_text = MSG_BATCH_LINKS_READY.format(count=len(chunk)) + f"\n\n`{chr(10).join(chunk)}`"
-        await handle_flood_wait(
+        chunk_text = MSG_BATCH_LINKS_READY.format(count=len(chunk), links="\n".join(chunk))
+        # chunks stay in order; the group reply and DM target different chats
+        tasks = [handle_flood_wait(
             msg.reply_text,
             chunk_text,
             quote=True,
-            link_preview_options=LinkPreviewOptions(is_disabled=True),
+            link_preview_options=_NO_PREVIEW,
             parse_mode=enums.ParseMode.MARKDOWN
-        )
+        )]
         if msg.chat.type != enums.ChatType.PRIVATE and msg.from_user:
-            try:
-                await handle_flood_wait(
-                    bot.send_message,
-                    chat_id=msg.from_user.id,
-                    text=MSG_DM_BATCH_PREFIX.format(chat_title=msg.chat.title or "the chat") + "\n" + chunk_text,
-                    link_preview_options=LinkPreviewOptions(is_disabled=True),
-                    parse_mode=enums.ParseMode.MARKDOWN
-                )
-            except Exception as e:
-                logger.error(f"Error sending DM in batch: {e}", exc_info=True)
-                await reply_user_err(msg, MSG_ERROR_DM_FAILED)
+            tasks.append(_send_dm_batch(bot, msg, chunk_text))
+        reply_result, *_ = await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(reply_result, Exception):
+            raise reply_result
+        if reply_result is None:
+            # handle_flood_wait gives up with None after repeated FloodWaits
+            logger.error(f"Batch links chunk {i // 20 + 1} was not delivered to chat {msg.chat.id} after FloodWait retries.")
+            undelivered += len(chunk)
         if i + 20 < len(links_list):
             await asyncio.sleep(0.5)
-    await handle_flood_wait(
-        status_msg.edit_text,
-        MSG_PROCESSING_RESULT.format(
-            processed=processed,
-            total=count,
-            failed=failed
-        )
-  )
+    result_text = MSG_PROCESSING_RESULT.format(
+        processed=processed,
+        total=count,
+        failed=failed
+    )
+    if duplicates:
+        result_text += "\n" + MSG_PROCESSING_DUPLICATES.format(duplicates=duplicates)
+    if undelivered:
+        result_text += "\n" + MSG_BATCH_LINKS_UNDELIVERED.format(count=undelivered)
+    await handle_flood_wait(status_msg.edit_text, result_text)
@@ -10,6 +10,7 @@ from pyrogram.errors import FloodWait
 from pyrogram.types import (InlineKeyboardButton, InlineKeyboardMarkup,
                             LinkPreviewOptions, Message, User)
 
+from Thunder.utils.cache import TTLCache
 from Thunder.utils.database import db
 from Thunder.utils.file_properties import get_fname, get_fsize, get_hash
 from Thunder.utils.handler import handle_flood_wait
@@ -20,6 +21,7 @@ from Thunder.utils.messages import (MSG_BUTTON_GET_HELP, MSG_DC_UNKNOWN,
 from Thunder.utils.shortener import shorten
 from Thunder.vars import Var
 
+_admin_cache = TTLCache(ttl=60)
 
 
 async def notify_ch(cli: Client, txt: str):
@@ -101,10 +103,16 @@ async def get_user(cli: Client, qry: Any) -> Optional[User]:
 
 
 async def is_admin(cli: Client, chat_id_val: int) -> bool:
+    key = (cli.me.id, chat_id_val)
+    cached = _admin_cache.get(key)
+    if cached is not None:
+        return cached
     member = await handle_flood_wait(cli.get_chat_member, chat_id_val, cli.me.id)
     if member is None:
         return False
-    return member.status in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]
+    result = member.status in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]
+    _admin_cache.set(key, result)
+    return result
 
 
 async def reply(msg: Message, **kwargs):
@@ -0,0 +1,32 @@
+# Thunder/utils/cache.py
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -4,6 +4,7 @@ import datetime
 from typing import Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 from Thunder.vars import Var
+from Thunder.utils.cache import TTLCache
 from Thunder.utils.logger import logger
 
 class Database:
@@ -15,6 +16,7 @@ class Database:
         self.token_col: AsyncIOMotorCollection = self.db.tokens
         self.authorized_users_col: AsyncIOMotorCollection = self.db.authorized_users
         self.restart_message_col: AsyncIOMotorCollection = self.db.restart_message
+        self._user_exist_cache = TTLCache(ttl=300)
 
     async def ensure_indexes(self):
         try:
@@ -46,6 +48,7 @@ class Database:
         try:
             if not await self.is_user_exist(user_id):
                 await self.col.insert_one(self.new_user(user_id))
+                self._user_exist_cache.set(user_id, True)
                 logger.debug(f"Added new user {user_id} to database.")
         except Exception as e:
             logger.error(f"Error in add_user for user {user_id}: {e}", exc_info=True)
@@ -53,8 +56,12 @@ class Database:
 
 
     async def is_user_exist(self, user_id: int) -> bool:
+        cached = self._user_exist_cache.get(user_id)
+        if cached is not None:
+            return cached
         try:
             user = await self.col.find_one({'id': user_id}, {'_id': 1})
+            self._user_exist_cache.set(user_id, bool(user))
             return bool(user)
         except Exception as e:
             logger.error(f"Error in is_user_exist for user {user_id}: {e}", exc_info=True)
@@ -77,6 +84,7 @@ class Database:
     async def delete_user(self, user_id: int):
         try:
             await self.col.delete_one({'id': user_id})
+            self._user_exist_cache.pop(user_id)
             logger.debug(f"Deleted user {user_id}.")
         except Exception as e:
             logger.error(f"Error in delete_user for user {user_id}: {e}", exc_info=True)
@@ -6,6 +6,7 @@ from pyrogram import Client
 from pyrogram.errors import FloodWait, UserNotParticipant
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
+from Thunder.utils.cache import TTLCache
 from Thunder.utils.handler import handle_flood_wait
 from Thunder.utils.logger import logger
 from Thunder.utils.messages import MSG_COMMUNITY_CHANNEL
@@ -13,6 +14,7 @@ from Thunder.vars import Var
 
 _force_link = None
 _force_title = None
+_member_cache = TTLCache(ttl=60)
 
 async def get_force_info(bot: Client):
     global _force_link, _force_title
@@ -40,6 +42,9 @@ async def force_channel_check(client: Client, message: Message):
     if message.from_user is None:
         return True
 
+    if _member_cache.get(message.from_user.id):
+        return True
+
     try:
         while True:
             try:
@@ -47,6 +52,7 @@ async def force_channel_check(client: Client, message: Message):
                 if member is None:
                     logger.error(f"Failed to get chat member for {message.from_user.id} in force channel {Var.FORCE_CHANNEL_ID} after retries.")
                     return False
+                _member_cache.set(message.from_user.id, True)
                 return True
             except FloodWait as e:
                 logger.debug(f"FloodWait in force_channel_check, sleeping for {e.value}s")
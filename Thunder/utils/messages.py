@@ -263,9 +263,11 @@ MSG_NEW_FILE_REQUEST = (
 # ------ Batch Processing ------
 MSG_PROCESSING_BATCH = "♻️ **Processing Batch {batch_number}/{total_batches}** ({file_count} files)"
 MSG_PROCESSING_STATUS = "📊 **Processing Files:** {processed}/{total} complete, {failed} failed"
-MSG_BATCH_LINKS_READY = "🔗 Here are your {count} download links:"
+MSG_BATCH_LINKS_READY = "🔗 Here are your {count} download links:\n\n`{links}`"
 MSG_DM_BATCH_PREFIX = "📬 **Batch Links from {chat_title}**\n"
 MSG_PROCESSING_RESULT = "✅ **Process Complete:** {processed}/{total} files processed successfully, {failed} failed"
+MSG_PROCESSING_DUPLICATES = "♻️ **Skipped {duplicates} duplicate file(s).**"
+MSG_BATCH_LINKS_UNDELIVERED = "⚠️ **{count} link(s) could not be sent here due to rate limits.**"
 
 # =====================================================================================
 # ====== BROADCAST MESSAGES ======
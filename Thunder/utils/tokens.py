@@ -6,10 +6,13 @@ from typing import Optional, Dict, Any, List
 import asyncio
 import random
 import pyrogram.errors
+from Thunder.utils.cache import TTLCache
 from Thunder.utils.database import db
 from Thunder.vars import Var
 from Thunder.utils.logger import logger
 
+_allowed_cache = TTLCache(ttl=60)
+
 async def check(user_id: int) -> bool:
     try:
         logger.debug(f"Token validation started for user: {user_id}")
@@ -83,11 +86,15 @@ async def generate(user_id: int) -> str:
         raise
 
 async def allowed(user_id: int) -> bool:
+    cached = _allowed_cache.get(user_id)
+    if cached is not None:
+        return cached
     try:
         result = await db.authorized_users_col.find_one(
             {"user_id": user_id},
             {"_id": 1}
         )
+        _allowed_cache.set(user_id, bool(result))
         return bool(result)
     except Exception as e:
         logger.error(f"Error in allowed for user {user_id}: {e}", exc_info=True)
@@ -105,6 +112,7 @@ async def authorize(user_id: int, authorized_by: int) -> bool:
             {"$set": auth_data},
             upsert=True
         )
+        _allowed_cache.set(user_id, True)
         return True
     except Exception as e:
         logger.error(f"Error in authorize for user {user_id}: {e}", exc_info=True)
@@ -113,6 +121,7 @@ async def authorize(user_id: int, authorized_by: int) -> bool:
 async def deauthorize(user_id: int) -> bool:
     try:
         result = await db.authorized_users_col.delete_one({"user_id": user_id})
+        _allowed_cache.set(user_id, False)
         return result.deleted_count > 0
     except Exception as e:
         logger.error(f"Error in deauthorize for user {user_id}: {e}", exc_info=True)
@@ -65,6 +65,9 @@ class Var:
         raise ValueError("DATABASE_URL is required")
 
     MAX_BATCH_FILES: int = int(os.getenv("MAX_BATCH_FILES", "50"))
+    BATCH_CONCURRENCY: int = max(1, int(os.getenv("BATCH_CONCURRENCY", "5")))
+    # messages fetched per get_messages call; Telegram accepts at most 100 IDs per request
+    BATCH_WINDOW: int = min(100, max(1, int(os.getenv("BATCH_WINDOW", "50"))))
 
     BANNED_CHANNELS: Set[int] = str_to_int_set(os.getenv("BANNED_CHANNELS", ""))
 